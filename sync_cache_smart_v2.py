@@ -1,21 +1,30 @@
 import os
 import sys
 import hashlib
+import mmap
 import subprocess
 import importlib.util
 import threading
 import platform
 import shutil
 import pickle
+import queue
+import gzip
+import sqlite3
 import logging
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import concurrent.futures
+import contextlib
+import multiprocessing
+import itertools
 import re
 import json
 import tempfile
+import time
 from pathlib import Path
 from datetime import datetime
+from collections import defaultdict
 
 # --- LOGGING ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s', datefmt='%H:%M:%S')
@@ -85,65 +94,154 @@ def install_and_import(package, pip_name=None, min_version=None):
         log.warning(f"Could not import {package}: {e}")
         return None
 
-# send2trash >= 1.5.0 is required for batched (list) deletion
-send2trash = install_and_import('send2trash', min_version='1.5.0')
-PIL = install_and_import('PIL', pip_name='Pillow')
+def _optional_import(package):
+    """Import an optional dependency, or return None if it isn't installed.
+    Never runs pip, so startup stays fast; see install_and_import for that."""
+    try:
+        return importlib.import_module(package)
+    except ImportError:
+        return None
+
+# send2trash >= 1.5.0 is required for batched (list) deletion; offered for
+# install on first use if missing (see App._require_send2trash)
+SEND2TRASH_MIN_VERSION = '1.5.0'
+send2trash = _optional_import('send2trash')
+PIL = _optional_import('PIL')
 if PIL:
     from PIL import Image, ImageTk
-fitz = install_and_import('pymupdf')
-if fitz is None:
-    fitz = install_and_import('fitz')
+fitz = _optional_import('pymupdf') or _optional_import('fitz')
+# BLAKE3 hashes several times faster than MD5 (SIMD + optional multithreading)
+blake3 = _optional_import('blake3')
+# xxHash's XXH3-128 is the next best: non-cryptographic, SIMD, single-threaded
+xxhash = None if blake3 else _optional_import('xxhash')
+
+# platform.system() is not free; resolve it once
+IS_WINDOWS = platform.system() == 'Windows'
+IS_MAC = platform.system() == 'Darwin'
+
+# Windows paths past MAX_PATH only open with the \\?\ prefix
+LONG_PATH_PREFIX = '\\\\?\\'
+MAX_PATH_LEN = 259
+
+def add_long_path_prefix(path):
+    r"""Prefix an absolute path with \\?\ on Windows if it is too long to open without it."""
+    if IS_WINDOWS and len(path) > MAX_PATH_LEN and not path.startswith(LONG_PATH_PREFIX):
+        return LONG_PATH_PREFIX + path
+    return path
+
+def strip_long_path_prefix(path):
+    r"""Remove a \\?\ prefix added by prepare_path(), e.g. for display or comparison."""
+    path = str(path)
+    if path.startswith(LONG_PATH_PREFIX):
+        return path[len(LONG_PATH_PREFIX):]
+    return path
 
 def prepare_path(path):
     path = os.path.normpath(path)
     path = os.path.abspath(path)
-    if platform.system() == 'Windows' and len(path) > 259 and not path.startswith('\\\\?\\'):
-        path = '\\\\?\\' + path
-    return path
+    return add_long_path_prefix(path)
+
+# Directories listed at once during a scan; several listings in flight hide
+# per-request latency on network and cloud drives
+LIST_WORKERS = 8
+
+def _scan_dir(path):
+    """List one directory. Returns ([(file path, stat_result), ...], [subdir path, ...]).
+    Symlinks are not followed; an unreadable folder is skipped, like os.walk."""
+    files = []
+    dirs = []
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return files, dirs
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    # Served from the directory listing on Windows
+                    files.append((entry.path, entry.stat(follow_symlinks=False)))
+            except OSError as e:
+                log.warning(f"Error processing {entry.path}: {e}")
+    return files, dirs
+
+def iter_files(root, workers=LIST_WORKERS):
+    """Yield (path, stat_result) for every regular file under root. Each folder is
+    listed as its own task on a thread pool, so listings overlap; order is not fixed.
+    Closing the generator early cancels the listings that haven't started."""
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    try:
+        pending = {executor.submit(_scan_dir, prepare_path(root))}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                files, dirs = future.result()
+                for d in dirs:
+                    pending.add(executor.submit(_scan_dir, d))
+                yield from files
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 def _norm_for_compare(p):
     """Normalize a path for case/format-tolerant comparison."""
-    p = str(p)
     # Strip Windows long-path prefix so prefixed/non-prefixed paths compare equal
-    if p.startswith('\\\\?\\'):
-        p = p[4:]
+    p = strip_long_path_prefix(p)
     try:
         p = os.path.normpath(os.path.abspath(p))
     except Exception:
         pass
     # Windows file system is case-insensitive
-    if platform.system() == 'Windows':
+    if IS_WINDOWS:
         p = p.lower()
     # Strip any trailing separator so 'D:\foo' and 'D:\foo\' compare equal
     p = p.rstrip(os.sep).rstrip('/')
     return p
 
+def make_subpath_checker(*parents):
+    """Return a one-argument test: is path the same as, or nested inside, any of
+    parents? The parents are normalized once, for checking many paths against the
+    same folders. Empty parents match nothing."""
+    prefixes = []
+    for parent in parents:
+        try:
+            parent = _norm_for_compare(parent) if parent else ''
+        except Exception:
+            parent = ''
+        if parent:
+            prefixes.append(parent)
+    if not prefixes:
+        return lambda path: False
+    exact = frozenset(prefixes)
+    # str.startswith takes a tuple, so all parents are tried in one call
+    prefixes = tuple(parent + os.sep for parent in prefixes)
+
+    def check(path):
+        try:
+            path = _norm_for_compare(path)
+        except Exception:
+            return False
+        return path in exact or path.startswith(prefixes)
+    return check
+
 def is_subpath(path, parent):
     r"""True if 'path' is the same as, or nested inside, 'parent'.
     Case-insensitive on Windows. Tolerates the \\?\ long-path prefix.
     Uses a trailing-separator check so 'D:\foo' does NOT match 'D:\foobar'."""
-    if not parent:
-        return False
-    try:
-        path = _norm_for_compare(path)
-        parent = _norm_for_compare(parent)
-        if not parent:
-            return False
-        if path == parent:
-            return True
-        return path.startswith(parent + os.sep)
-    except Exception:
-        return False
+    return make_subpath_checker(parent)(path)
 
 def reveal_in_explorer(path):
     path = prepare_path(path)
     try:
-        if platform.system() == 'Windows':
-            subprocess.Popen(f'explorer /select,"{path}"')
-        elif platform.system() == 'Darwin':
-            subprocess.call(['open', '-R', path])
+        if IS_WINDOWS:
+            # Explorer rejects the \\?\ long-path prefix in /select
+            path = strip_long_path_prefix(path)
+            # List argv: no cmd.exe string parsing, and quotes/spaces in the path are safe
+            subprocess.Popen(['explorer', '/select,', path])
+        elif IS_MAC:
+            subprocess.Popen(['open', '-R', path])
         else:
-            subprocess.call(['xdg-open', os.path.dirname(path)])
+            subprocess.Popen(['xdg-open', os.path.dirname(path)])
     except Exception as e:
         log.warning(f"Could not open explorer for {path}: {e}")
 
@@ -153,7 +251,7 @@ def detect_optimal_threads():
     drive_type = "Unknown"
     recommended = cpu_cores * 4
 
-    if platform.system() == "Windows":
+    if IS_WINDOWS:
         try:
             result = subprocess.run(
                 ["powershell", "-NoProfile", "-Command",
@@ -237,26 +335,104 @@ def format_size(size_bytes):
         return f"{size_bytes / 1024:.1f} KB"
     return f"{size_bytes} B"
 
-def hash_file_full(filepath, stop_event=None):
-    """Full MD5 hash of entire file."""
-    hasher = hashlib.md5()
-    with open(filepath, 'rb') as f:
+# Without blake3 or xxhash, SHA-256 is the fallback: OpenSSL uses the SHA-NI
+# instructions on modern CPUs, which beats MD5 per byte.
+HASH_NAME = "BLAKE3" if blake3 else "XXH3-128" if xxhash else "SHA-256"
+# Files above this size are hashed by BLAKE3 with multiple threads; below it
+# the thread start-up costs more than it saves.
+BLAKE3_MT_THRESHOLD = 1024 * 1024
+READ_CHUNK = 1024 * 1024
+# Files above this size are hashed straight from a memory map (no per-chunk bytes
+# objects); the map is fed to the hasher in slices so Cancel still gets a look in
+MMAP_THRESHOLD = 8 * 1024 * 1024
+MMAP_SLICE = 64 * 1024 * 1024
+# A 32-bit process can't map a file anywhere near 2 GB into its address space
+MMAP_MAX = sys.maxsize if sys.maxsize > 2**32 else 512 * 1024 * 1024
+# blake3's update_mmap and hashlib.file_digest can't be interrupted, so when Cancel
+# is possible, bigger files are hashed in slices that check for it in between
+FILE_DIGEST_MAX = 256 * 1024 * 1024
+
+def _advise_sequential(f):
+    """Tell the kernel f will be read front to back, so it reads ahead more
+    aggressively. No-op where posix_fadvise doesn't exist (Windows, macOS)."""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+def _new_hasher(size=0, threads=None):
+    """Return a fresh content hasher, multithreaded for large files when possible.
+    threads caps BLAKE3's own threads (None = one per core)."""
+    if blake3:
+        if size > BLAKE3_MT_THRESHOLD and threads != 1:
+            return blake3.blake3(max_threads=threads or blake3.blake3.AUTO)
+        return blake3.blake3()
+    if xxhash:
+        return xxhash.xxh3_128()
+    return hashlib.sha256()
+
+def hash_file_full(filepath, stop_event=None, size=None, threads=None):
+    """Full content hash of entire file. Pass size if already known to skip a stat,
+    and threads when several files are hashed at once (see hash_threads)."""
+    if stop_event and stop_event.is_set():
+        return None
+    if size is None:
+        size = os.path.getsize(filepath)
+    hasher = _new_hasher(size, threads)
+    if blake3 and size and (stop_event is None or size <= FILE_DIGEST_MAX):
+        # blake3 memory-maps the file itself; no Python-level read loop at all.
+        # It can't be interrupted either, so big files take the sliced paths below
+        try:
+            hasher.update_mmap(filepath)
+            return hasher.digest()
+        except (OSError, ValueError):
+            # Some network/cloud filesystems can't be mapped; read it normally instead
+            hasher = _new_hasher(size, threads)
+    if MMAP_THRESHOLD < size <= MMAP_MAX:
+        try:
+            with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                view = memoryview(mm)
+                try:
+                    for offset in range(0, len(mm), MMAP_SLICE):
+                        if stop_event and stop_event.is_set():
+                            return None
+                        hasher.update(view[offset:offset + MMAP_SLICE])
+                finally:
+                    view.release()
+            return hasher.digest()
+        except (OSError, ValueError):
+            # Some network/cloud filesystems can't be mapped; read it normally instead
+            hasher = _new_hasher(size, threads)
+    if sys.version_info >= (3, 11) and (stop_event is None or size <= FILE_DIGEST_MAX):
+        # file_digest runs the read/update loop with a reused buffer and no
+        # per-chunk bytes allocations
+        with open(filepath, 'rb', buffering=0) as f:
+            _advise_sequential(f)
+            return hashlib.file_digest(f, lambda: hasher).digest()
+
+    # 1 MiB reads: far fewer syscalls than 64 KB on big files
+    with open(filepath, 'rb', buffering=READ_CHUNK) as f:
+        _advise_sequential(f)
         while True:
             if stop_event and stop_event.is_set():
                 return None
-            data = f.read(65536)
+            data = f.read(READ_CHUNK)
             if not data:
                 break
             hasher.update(data)
-    return hasher.hexdigest()
+    return hasher.digest()
 
-def hash_file_partial(filepath):
+def hash_file_partial(filepath, size=None):
     """Fast partial hash: first 64KB + last 64KB + file size.
     Catches 99%+ of duplicates without reading the full file.
     Much faster for large video files."""
     CHUNK = 65536
-    size = os.path.getsize(filepath)
-    hasher = hashlib.md5()
+    if size is None:
+        size = os.path.getsize(filepath)
+    hasher = _new_hasher()
     hasher.update(str(size).encode())  # include size in hash
     with open(filepath, 'rb') as f:
         # Read first chunk
@@ -265,176 +441,506 @@ def hash_file_partial(filepath):
         if size > CHUNK * 2:
             f.seek(-CHUNK, 2)
             hasher.update(f.read(CHUNK))
-    return hasher.hexdigest()
+    return hasher.digest()
 
 
 # --- 2. SCAN MODES ---
 # Mode 0: Smart = partial hash then full-hash only matches (fast + 100% reliable)
-# Mode 1: Full  = full MD5 hash everything (slow but simple)
+# Mode 1: Full  = full content hash of everything (slow but simple)
 SCAN_SMART = 0
 SCAN_FULL = 1
 
+# Minimum seconds between progress updates sent to the GUI during a scan
+UI_INTERVAL = 0.1
+# Minimum seconds between "N/total files" lines in the copy log
+LOG_INTERVAL = 1.0
+
+# Hash jobs with more files than this go to worker processes; smaller ones run on
+# threads, since spawning workers (each re-importing this script) costs more than
+# the GIL does there, and the hashers release the GIL on big buffers anyway
+PROCESS_POOL_MIN_FILES = 1000
+
+# Files at least this big are dispatched to hash workers one at a time
+LARGE_FILE_BYTES = 1024 * 1024
+
+# Spawned (not forked) workers: forking a process that is running Tk and
+# other threads is unsafe, and spawn behaves the same on every platform.
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+def hash_threads(concurrent_files):
+    """BLAKE3 threads per file when this many large files are hashed side by side:
+    the cores are shared out, so pool workers x BLAKE3 threads doesn't oversubscribe."""
+    cores = os.cpu_count() or 4
+    return max(1, cores // max(1, concurrent_files))
+
+# The scan's stop event inside hash worker processes (see _init_hash_worker)
+_worker_stop_event = None
+
+def _init_hash_worker(stop_event):
+    """ProcessPoolExecutor initializer: multiprocessing events can't be pickled
+    with each task, only handed to a worker process when it starts."""
+    global _worker_stop_event
+    _worker_stop_event = stop_event
+
+def get_identifier(filepath, scan_mode, size=None, threads=None, stop_event=None):
+    """Return (filepath, ident, size, error) for one file; ident is None if cancelled.
+    Module-level so it can be pickled into ProcessPoolExecutor workers.
+    Pass size when it is already known from the listing to skip another stat."""
+    try:
+        if size is None:
+            size = os.stat(filepath).st_size
+
+        if scan_mode == SCAN_SMART:
+            # Partial hash - fast, then verified with full hash on matches
+            phash = hash_file_partial(filepath, size)
+            return (filepath, ('partial', size, phash), size, None)
+
+        # Full hash - 100% reliable
+        fhash = hash_file_full(filepath, stop_event or _worker_stop_event, size=size, threads=threads)
+        if fhash is None:
+            return (filepath, None, size, None)
+        return (filepath, ('full', size, fhash), size, None)
+
+    except Exception as e:
+        return (filepath, None, 0, str(e))
+
+
+# Hashes from earlier scans, so unchanged files aren't read again
+HASH_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".sync_cache_smart_hashes.db")
+
+class HashCache:
+    """Persistent store of file hashes keyed by path and hash kind ('partial'/'full').
+    An entry is only used while the file's mtime, size and the hash algorithm match.
+    Only use it from the thread that created it."""
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path=HASH_CACHE_PATH):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Version 1 stores raw digest bytes; older databases held hex strings,
+        # which would never compare equal to freshly computed digests
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS hashes")
+            self.conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " path TEXT NOT NULL, kind TEXT NOT NULL, mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL, algo TEXT NOT NULL, digest BLOB NOT NULL,"
+            " PRIMARY KEY (path, kind))")
+
+    @classmethod
+    def open(cls):
+        """Open the cache, or return None (scan without it) if it can't be opened."""
+        try:
+            return cls()
+        except sqlite3.Error as e:
+            log.warning(f"Hash cache unavailable, hashing everything: {e}")
+            return None
+
+    # Paths per SELECT ... IN (...); stays under SQLite's default 999-variable limit
+    LOOKUP_CHUNK = 500
+
+    def _disable(self, e):
+        """A failing database only costs speed: log it and scan on without the cache."""
+        log.warning(f"Hash cache error, hashing without it: {e}")
+        self.close()
+
+    def lookup(self, kind, files):
+        """files: iterable of (path, size, mtime_ns). Returns {path: digest} for fresh entries."""
+        found = {}
+        if self.conn is None:
+            return found
+        wanted = {path: (mtime_ns, size) for path, size, mtime_ns in files}
+        paths = list(wanted)
+        try:
+            for i in range(0, len(paths), self.LOOKUP_CHUNK):
+                chunk = paths[i:i + self.LOOKUP_CHUNK]
+                query = ("SELECT path, mtime_ns, size, algo, digest FROM hashes"
+                         f" WHERE kind = ? AND path IN ({','.join('?' * len(chunk))})")
+                for path, mtime_ns, size, algo, digest in self.conn.execute(query, (kind, *chunk)):
+                    if wanted[path] == (mtime_ns, size) and algo == HASH_NAME:
+                        found[path] = digest
+        except sqlite3.Error as e:
+            self._disable(e)
+            return {}
+        return found
+
+    def store(self, kind, rows):
+        """rows: list of (path, size, mtime_ns, digest)."""
+        if not rows or self.conn is None:
+            return
+        try:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO hashes (path, kind, mtime_ns, size, algo, digest) VALUES (?, ?, ?, ?, ?, ?)",
+                [(path, kind, mtime_ns, size, HASH_NAME, digest) for path, size, mtime_ns, digest in rows])
+            self.conn.commit()
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def prune(self, roots, listed):
+        """Delete entries under the given folders whose path was not in the fresh
+        listing (the file was deleted, moved or renamed). listed: set of paths."""
+        if self.conn is None:
+            return
+        try:
+            stale = []
+            for root in roots:
+                prefix = root.rstrip(os.sep) + os.sep
+                # Every path starting with prefix sorts between these two, so the
+                # primary key index answers this without a table scan
+                end = prefix[:-1] + chr(ord(os.sep) + 1)
+                stale.extend(path for path, in self.conn.execute(
+                    "SELECT DISTINCT path FROM hashes WHERE path >= ? AND path < ?", (prefix, end))
+                    if path not in listed)
+            if stale:
+                self.conn.executemany("DELETE FROM hashes WHERE path = ?", [(p,) for p in stale])
+                self.conn.commit()
+                log.info(f"Dropped {len(stale)} stored hash(es) of files that are gone")
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+# Saved scan results (Cache / Save menu) are gzip-compressed JSON. Earlier
+# versions wrote pickles; those still load, but only open files you saved yourself.
+SCAN_RESULTS_VERSION = 2
+_DIGEST_KINDS = ('partial', 'full')
+
+def save_scan_results(filename, master_idx, target_idx, mode):
+    """Write both indices to filename. Digest bytes are stored as hex."""
+    def encode(idx):
+        return [[[v.hex() if isinstance(v, bytes) else v for v in ident], entries]
+                for ident, entries in idx.items()]
+    data = {'version': SCAN_RESULTS_VERSION, 'mode': mode,
+            'master': encode(master_idx), 'target': encode(target_idx)}
+    with gzip.open(filename, 'wt', encoding='utf-8', compresslevel=3) as f:
+        json.dump(data, f, separators=(',', ':'))
+
+def load_scan_results(filename):
+    """Return (master_idx, target_idx, mode) from a saved results file."""
+    with open(filename, 'rb') as f:
+        is_gzip = f.read(2) == b'\x1f\x8b'
+    if not is_gzip:
+        with open(filename, 'rb') as f:
+            data = pickle.load(f)
+        return data.get('master', {}), data.get('target', {}), data.get('mode', 2)
+
+    with gzip.open(filename, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+
+    def decode(rows):
+        idx = {}
+        for ident, entries in rows:
+            if ident[0] in _DIGEST_KINDS:
+                ident[2] = bytes.fromhex(ident[2])
+            idx[tuple(ident)] = [tuple(e) for e in entries]
+        return idx
+    return decode(data.get('master', [])), decode(data.get('target', [])), data.get('mode', 2)
+
 
 # --- 3. LOGIC ENGINE ---
 class Comparator(threading.Thread):
-    def __init__(self, master_path, target_path, scan_mode, callback_update, callback_finish, callback_alert):
+    # Large camera/video files: with "trust size" on, same extension + same size
+    # is treated as identical without reading the file. RAW formats are left out:
+    # one camera writes many RAW files of exactly the same size
+    FAST_EXT = {'.jpg', '.jpeg', '.heic', '.mp4', '.mov', '.mkv'}
+    FAST_EXT_MIN_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, master_path, target_path, scan_mode, callback_update, callback_finish, callback_alert,
+                 trust_media_size=False):
         super().__init__()
         self.master = master_path
         self.target = target_path
         self.scan_mode = scan_mode
+        self.trust_media_size = trust_media_size
         self.update_ui = callback_update
         self.finish = callback_finish
         self.alert = callback_alert
         self.daemon = True
-        self.stop_event = threading.Event()
+        # A multiprocessing event, so Cancel also reaches hash worker processes
+        self.stop_event = _MP_CONTEXT.Event()
+        # path -> (st_dev, st_ino) for files with more than one hard link
+        self.hardlinks = {}
+        # alias path -> path of another hard link to the same file that gets hashed instead
+        self.hardlink_aliases = {}
+        # path -> st_mtime_ns, for validating hash cache entries
+        self.mtimes = {}
+        self.hash_cache = None
 
         try:
             self.max_threads = (os.cpu_count() or 4) + 2
         except Exception:
             self.max_threads = 4
 
-    def get_identifier(self, filepath):
-        if self.stop_event.is_set():
-            return (filepath, None, 0)
-        try:
-            stat = os.stat(filepath)
-            size = stat.st_size
-
-            if self.scan_mode == SCAN_SMART:
-                # Partial hash - fast, then verified with full hash on matches
-                phash = hash_file_partial(filepath)
-                return (filepath, ('partial', size, phash), size)
-
-            else:
-                # Full hash - 100% reliable
-                fhash = hash_file_full(filepath, self.stop_event)
-                if fhash is None:
-                    return (filepath, None, size)
-                return (filepath, ('full', size, fhash), size)
-
-        except Exception as e:
-            log.warning(f"Error processing {filepath}: {e}")
-            return (filepath, None, 0)
-
-    def process_folder_parallel(self, folder, label):
-        if self.stop_event.is_set():
-            return {}
-        index = {}
-        all_files = []
-
-        self.update_ui(f"Listing files in {label}...", 0)
-        for root, _, files in os.walk(folder):
+    def index_sizes(self, folder, label):
+        """Phase 1: stat every file under folder. Returns {size: [path, ...]}.
+        Cheap compared to hashing, and lets us skip files that can't have a match."""
+        sizes = defaultdict(list)
+        # No total is known while walking, so the bar just shows activity
+        self.update_ui(f"Listing files in {label}...", None)
+        found = 0
+        last_ui = time.monotonic()
+        for path, st in iter_files(folder):
             if self.stop_event.is_set():
                 return {}
-            for file in files:
-                all_files.append(prepare_path(os.path.join(root, file)))
+            found += 1
+            now = time.monotonic()
+            if now - last_ui >= UI_INTERVAL:
+                last_ui = now
+                self.update_ui(f"Listing files in {label}... {found} found", None)
+            # Only paths past MAX_PATH need the \\?\ prefix; the root already went through
+            # prepare_path, so the path is absolute and normalized
+            path = add_long_path_prefix(path)
+            size = st.st_size
+            self.mtimes[path] = st.st_mtime_ns
+            # st_nlink/st_ino are 0 from DirEntry.stat() on Windows, so this is POSIX-only
+            if st.st_nlink > 1 and st.st_ino:
+                self.hardlinks[path] = (st.st_dev, st.st_ino)
+            sizes[size].append(path)
+        return sizes
+
+    def split_hardlinks(self, files):
+        """Drop all but one (path, size) per hard-linked file from files, recording the
+        rest in self.hardlink_aliases. Hard links are the same bytes on disk, so
+        they are duplicates without reading anything."""
+        if not self.hardlinks:
+            return files
+        first_seen = {}
+        keep = []
+        for path, size in files:
+            key = self.hardlinks.get(path)
+            if key is not None:
+                if key in first_seen:
+                    self.hardlink_aliases[path] = first_seen[key]
+                    continue
+                first_seen[key] = path
+            keep.append((path, size))
+        if self.hardlink_aliases:
+            log.info(f"Skipping {len(self.hardlink_aliases)} hard-linked file(s); their link target is hashed once")
+        return keep
+
+    def hash_paths(self, files):
+        """Phase 2: hash the given (path, size) files, largest first, on a thread pool,
+        or in worker processes above PROCESS_POOL_MIN_FILES files.
+        Returns {path: ident}; files that could not be read are left out."""
+        idents = {}
+        kind = 'partial' if self.scan_mode == SCAN_SMART else 'full'
+        if self.hash_cache and files:
+            cached = self.hash_cache.lookup(kind, ((p, size, self.mtimes.get(p)) for p, size in files))
+            for path, size in files:
+                if path in cached:
+                    idents[path] = (kind, size, cached[path])
+            if cached:
+                log.info(f"Reused {len(cached)} cached hash(es)")
+                files = [f for f in files if f[0] not in cached]
 
-        total = len(all_files)
+        total = len(files)
         if total == 0:
-            return {}
+            return idents
 
         completed = 0
-        self.update_ui(f"Processing {label}: 0/{total}", 0)
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-            future_to_file = {executor.submit(self.get_identifier, f): f for f in all_files}
-
-            for i, future in enumerate(concurrent.futures.as_completed(future_to_file)):
+        last_ui = 0.0
+        new_rows = []
+        self.update_ui(f"Hashing: 0/{total}", 0)
+
+        # Hashing is CPU-bound, so big jobs run in worker processes rather than threads
+        workers = os.cpu_count() or 4
+        if total > PROCESS_POOL_MIN_FILES:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT,
+                                                              initializer=_init_hash_worker,
+                                                              initargs=(self.stop_event,))
+            stop = None  # workers got it from _init_hash_worker
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+            stop = self.stop_event
+        with executor:
+            # Large files go out one per task so they spread across workers; small
+            # ones are batched to cut IPC overhead and fill in behind them. Sizes come
+            # from the listing, so workers don't stat every file a second time
+            large = [f for f in files if f[1] >= LARGE_FILE_BYTES]
+            small = [f for f in files if f[1] < LARGE_FILE_BYTES]
+            mode = itertools.repeat(self.scan_mode)
+            # Up to one large file per worker is hashed at a time; share the cores between them
+            threads = itertools.repeat(hash_threads(min(workers, len(large))))
+            results = itertools.chain(
+                executor.map(get_identifier, (p for p, _ in large), mode, (s for _, s in large), threads,
+                             itertools.repeat(stop), chunksize=1),
+                executor.map(get_identifier, (p for p, _ in small), mode, (s for _, s in small), chunksize=32))
+            for path, ident, size, error in results:
                 if self.stop_event.is_set():
+                    executor.shutdown(wait=False, cancel_futures=True)
                     break
 
-                path, ident, size = future.result()
                 if ident:
-                    if ident not in index:
-                        index[ident] = []
-                    index[ident].append((path, size))
+                    idents[path] = ident
+                    new_rows.append((path, size, self.mtimes.get(path), ident[2]))
+                elif error:
+                    log.warning(f"Error processing {path}: {error}")
 
                 completed += 1
-                if completed % 100 == 0 or completed == total:
-                    self.update_ui(f"Processing {label}: {completed}/{total}", (completed / total) * 100)
-
-        return index
+                # Throttle by wall clock, not file count: fast scans would flood Tk's event queue
+                now = time.monotonic()
+                if now - last_ui >= UI_INTERVAL or completed == total:
+                    last_ui = now
+                    self.update_ui(f"Hashing: {completed}/{total}", (completed / total) * 100)
+
+        if self.hash_cache:
+            self.hash_cache.store(kind, [r for r in new_rows if r[2] is not None])
+        return idents
+
+    @staticmethod
+    def build_index(sizes, candidate_sizes, idents):
+        """Turn a {size: [paths]} map into the {ident: [(path, size)]} index.
+        Files with a size nobody else has get a ('unique', size, path) ident."""
+        index = defaultdict(list)
+        for size, paths in sizes.items():
+            for path in paths:
+                if size in candidate_sizes:
+                    ident = idents.get(path)
+                    if ident is None:
+                        continue  # unreadable, already logged
+                else:
+                    ident = ('unique', size, path)
+                index[ident].append((path, size))
+        # Plain dict: the App looks idents up and must not create entries by accident
+        return dict(index)
 
     def verify_with_full_hash(self, all_indices):
         """Stage 2 for Smart mode: full-hash only the files that matched by partial hash.
         Takes a list of index dicts, finds groups with 2+ files, full-hashes those files,
         and returns corrected indices."""
         # Collect all partial-hash keys that have duplicates (across all indices combined)
-        combined = {}
+        combined = defaultdict(list)
         for idx in all_indices:
             for ident, entries in idx.items():
-                if ident not in combined:
-                    combined[ident] = []
                 combined[ident].extend(entries)
 
-        # Only need to verify keys where 2+ files matched
-        needs_verify = {k: v for k, v in combined.items() if len(v) > 1}
+        # Only need to verify partial-hash keys where 2+ files matched
+        needs_verify = {k: v for k, v in combined.items() if len(v) > 1 and k[0] == 'partial'}
         all_files_to_hash = []
         for entries in needs_verify.values():
-            all_files_to_hash.extend(entries)
+            # Hard-link aliases get their link target's hash below
+            all_files_to_hash.extend(e for e in entries if e[0] not in self.hardlink_aliases)
+        all_files_to_hash.sort(key=lambda e: e[1], reverse=True)  # largest first
 
-        total = len(all_files_to_hash)
-        if total == 0:
-            return all_indices
+        full_hashes = {}  # path -> full_hash
+        if self.hash_cache and all_files_to_hash:
+            full_hashes = self.hash_cache.lookup(
+                'full', ((p, size, self.mtimes.get(p)) for p, size in all_files_to_hash))
+            all_files_to_hash = [e for e in all_files_to_hash if e[0] not in full_hashes]
 
+        total = len(all_files_to_hash)
         self.update_ui(f"Verifying {total} candidates with full hash...", 0)
 
         # Full-hash just the candidate files
-        full_hashes = {}  # path -> full_hash
+        new_rows = []
         completed = 0
+        last_ui = 0.0
+        threads = hash_threads(min(self.max_threads, total))
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_threads) as executor:
             future_map = {}
             for path, size in all_files_to_hash:
-                future_map[executor.submit(hash_file_full, path, self.stop_event)] = (path, size)
+                future_map[executor.submit(hash_file_full, path, self.stop_event, size, threads)] = (path, size)
 
             for future in concurrent.futures.as_completed(future_map):
                 if self.stop_event.is_set():
+                    # Running hashes see the event and return early; queued ones never start
+                    executor.shutdown(wait=False, cancel_futures=True)
                     return all_indices
                 path, size = future_map[future]
                 try:
                     fhash = future.result()
                     if fhash:
                         full_hashes[path] = fhash
+                        new_rows.append((path, size, self.mtimes.get(path), fhash))
                 except Exception as e:
                     log.warning(f"Verify hash failed for {path}: {e}")
 
                 completed += 1
-                if completed % 20 == 0 or completed == total:
+                now = time.monotonic()
+                if now - last_ui >= UI_INTERVAL or completed == total:
+                    last_ui = now
                     self.update_ui(f"Verifying: {completed}/{total}", (completed / total) * 100)
 
+        if self.hash_cache:
+            self.hash_cache.store('full', [r for r in new_rows if r[2] is not None])
+
+        for alias, canonical in self.hardlink_aliases.items():
+            if canonical in full_hashes:
+                full_hashes[alias] = full_hashes[canonical]
+
         # Rebuild each index: replace partial-hash keys with full-hash keys for verified files
         new_indices = []
         for idx in all_indices:
-            new_idx = {}
+            new_idx = defaultdict(list)
             for ident, entries in idx.items():
                 if ident in needs_verify:
                     # Re-key these entries by full hash
                     for path, size in entries:
                         if path in full_hashes:
-                            new_key = ('full', size, full_hashes[path])
-                            if new_key not in new_idx:
-                                new_idx[new_key] = []
-                            new_idx[new_key].append((path, size))
+                            new_idx[('full', size, full_hashes[path])].append((path, size))
                 else:
                     # Single file with this partial hash — keep as-is
                     new_idx[ident] = entries
-            new_indices.append(new_idx)
+            new_indices.append(dict(new_idx))
 
         return new_indices
 
     def run(self):
+        self.hash_cache = HashCache.open()
         try:
-            target_idx = self.process_folder_parallel(self.target, "Target")
+            master_sizes = {}
+            if self.master:
+                # Master and target are often on different drives (or a local disk
+                # and a cloud mount), so list both at the same time
+                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                    master_future = executor.submit(self.index_sizes, self.master, "Master")
+                    target_sizes = self.index_sizes(self.target, "Target")
+                    master_sizes = master_future.result()
+            else:
+                target_sizes = self.index_sizes(self.target, "Target")
+            if self.stop_event.is_set():
+                self.finish({}, {})
+                return
+            if self.hash_cache:
+                # Listed paths start from prepare_path(root), not the folder as typed
+                self.hash_cache.prune([prepare_path(r) for r in (self.master, self.target) if r], self.mtimes)
+
+            # A file can only be a duplicate if another file has the same size:
+            # a second target file, or a master file. Only those get hashed.
+            candidate_sizes = {s for s, ps in target_sizes.items() if len(ps) > 1 or s in master_sizes}
+            # Largest first, so big files don't end up as the stragglers of the pool
+            to_hash = list(dict.fromkeys(
+                (p, s) for s in sorted(candidate_sizes, reverse=True)
+                for sizes in (target_sizes, master_sizes)
+                for p in sizes.get(s, ())))
+            total_files = sum(len(ps) for ps in target_sizes.values()) + sum(len(ps) for ps in master_sizes.values())
+
+            size_only = {}
+            if self.trust_media_size:
+                size_only = {p: ('sizeonly', s, os.path.splitext(p)[1].lower())
+                             for p, s in to_hash
+                             if s >= self.FAST_EXT_MIN_SIZE and os.path.splitext(p)[1].lower() in self.FAST_EXT}
+                to_hash = [f for f in to_hash if f[0] not in size_only]
+                log.info(f"Matching {len(size_only)} large photo/video file(s) by size only")
+            log.info(f"Hashing {len(to_hash)} of {total_files} files (the rest have a unique size)")
+
+            idents = self.hash_paths(self.split_hardlinks(to_hash))
             if self.stop_event.is_set():
                 self.finish({}, {})
                 return
+            idents.update(size_only)
+            for alias, canonical in self.hardlink_aliases.items():
+                if canonical in idents:
+                    idents[alias] = idents[canonical]
 
-            master_idx = {}
-            if self.master:
-                master_idx = self.process_folder_parallel(self.master, "Master")
-                if self.stop_event.is_set():
-                    self.finish({}, {})
-                    return
+            target_idx = self.build_index(target_sizes, candidate_sizes, idents)
+            master_idx = self.build_index(master_sizes, candidate_sizes, idents) if self.master else {}
 
             # Smart mode: verify partial-hash matches with full hash
             if self.scan_mode == SCAN_SMART:
@@ -443,6 +949,10 @@ class Comparator(threading.Thread):
                     master_idx, target_idx = self.verify_with_full_hash([master_idx, target_idx])
                 else:
                     target_idx, = self.verify_with_full_hash([target_idx])
+                # A cancelled verify hands back partial-hash matches; they must not look verified
+                if self.stop_event.is_set():
+                    self.finish({}, {})
+                    return
 
             self.update_ui("Finishing...", 100)
             self.finish(master_idx, target_idx)
@@ -453,6 +963,9 @@ class Comparator(threading.Thread):
                 self.alert("Scan Error", f"Scan failed:\n{e}")
             except Exception:
                 pass
+        finally:
+            if self.hash_cache:
+                self.hash_cache.close()
 
 
 # --- 4. GUI APPLICATION ---
@@ -465,13 +978,22 @@ class App:
         self.master_path = None
         self.target_path = None
         self.protected_paths = []
+        self._protected_key = None
+        self._protected_check = None
+        self.comparator = None  # the running scan, if any
         self.cross_dupes = []
         self.internal_dupes = []
         self.only_in_target = []
+        # Paths matched by size alone (not byte-verified); kept out of bulk trashing
+        self.size_only_paths = set()
+        # (index, {path: ident}) for the stored indices; see calculate_and_populate
+        self._path_idents = []
 
         # Raw Data Storage (RAM)
         self.last_master_idx = {}
         self.last_target_idx = {}
+        # internal-tab group iid -> files, for groups not opened yet (see populate_trees)
+        self._lazy_groups = {}
 
         self.mode = tk.IntVar(value=2)
 
@@ -482,6 +1004,7 @@ class App:
         cache_menu.add_command(label="Load Scan Results from File...", command=self.load_cache)
         cache_menu.add_separator()
         cache_menu.add_command(label="Clear Current Results", command=self.clear_results)
+        cache_menu.add_command(label="Forget Stored File Hashes", command=self.clear_hash_cache)
         menubar.add_cascade(label="Cache / Save", menu=cache_menu)
         root.config(menu=menubar)
 
@@ -529,17 +1052,26 @@ class App:
         frame_act.pack(fill=tk.X, padx=10)
 
         self.scan_mode = tk.IntVar(value=SCAN_SMART)
-        scan_frame = tk.LabelFrame(frame_act, text="Scan Depth", padx=8, pady=4)
+        scan_frame = tk.LabelFrame(frame_act, text=f"Scan Depth ({HASH_NAME})", padx=8, pady=4)
         scan_frame.pack(side=tk.LEFT)
         tk.Radiobutton(scan_frame, text="Smart (recommended)", variable=self.scan_mode, value=SCAN_SMART).pack(side=tk.LEFT, padx=4)
         tk.Radiobutton(scan_frame, text="Full (hash everything)", variable=self.scan_mode, value=SCAN_FULL).pack(side=tk.LEFT, padx=4)
+        self.trust_media_size = tk.BooleanVar(value=False)
+        tk.Checkbutton(scan_frame, text="Match big photos/videos by size only (faster, less strict)",
+                       variable=self.trust_media_size).pack(side=tk.LEFT, padx=(12, 4))
 
         self.btn_scan = tk.Button(frame_act, text="START SCAN", bg="#4caf50", fg="white", font=("Arial", 10, "bold"), height=2, command=self.start_scan)
         self.btn_scan.pack(side=tk.RIGHT)
+        self.btn_cancel_scan = tk.Button(frame_act, text="CANCEL", bg="#f44336", fg="white", font=("Arial", 10, "bold"),
+                                         height=2, command=self.cancel_scan, state=tk.DISABLED)
+        self.btn_cancel_scan.pack(side=tk.RIGHT, padx=5)
 
         # STATUS
         self.progress = ttk.Progressbar(root, mode='determinate')
         self.progress.pack(fill=tk.X, padx=10, pady=5)
+        # Scan threads queue progress here; the Tk thread shows the newest ~10x a second
+        self._progress_queue = queue.Queue()
+        self.root.after(100, self._drain_progress)
         self.lbl_stat = tk.Label(root, text="Select folders or Load Cache.", fg="gray")
         self.lbl_stat.pack()
 
@@ -639,6 +1171,7 @@ class App:
 
         self.tree_internal.bind("<Double-1>", self.on_double_click)
         self.tree_internal.bind("<<TreeviewSelect>>", self._on_preview_select)
+        self.tree_internal.bind("<<TreeviewOpen>>", self._expand_group)
 
         paned.add(tree_frame, weight=3)
 
@@ -992,6 +1525,7 @@ class App:
             total = len(file_pairs)
             workers = min(threads, total) if total > 0 else 1
             self.root.after(0, self._append_copy_log, f"Found {total} files. {action} with {workers} threads...\n\n")
+            last_log = time.monotonic()
             with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
                 futures = {executor.submit(self._copy_single_file, pair): pair for pair in file_pairs}
                 for future in concurrent.futures.as_completed(futures):
@@ -1007,7 +1541,9 @@ class App:
                         failed += 1
                         self.root.after(0, self._append_copy_log, f"FAILED: {path} — {err}\n")
 
-                    if copied % 100 == 0 and copied > 0:
+                    now = time.monotonic()
+                    if now - last_log >= LOG_INTERVAL and copied > 0:
+                        last_log = now
                         self.root.after(0, self._append_copy_log, f"{action}: {copied}/{total} files...\n")
 
             if cancelled:
@@ -1182,9 +1718,9 @@ class App:
 
     def _open_preview_file(self):
         if self._preview_path and os.path.exists(self._preview_path):
-            if platform.system() == 'Windows':
+            if IS_WINDOWS:
                 os.startfile(self._preview_path)
-            elif platform.system() == 'Darwin':
+            elif IS_MAC:
                 subprocess.call(['open', self._preview_path])
             else:
                 subprocess.call(['xdg-open', self._preview_path])
@@ -1423,10 +1959,12 @@ WScript.Sleep 2000
             self.lst_protected.delete(i)
 
     def is_protected(self, path):
-        for p in self.protected_paths:
-            if is_subpath(path, p):
-                return True
-        return False
+        # Rebuilt only when the protected list changes; this runs once per row
+        key = tuple(self.protected_paths)
+        if key != self._protected_key:
+            self._protected_key = key
+            self._protected_check = make_subpath_checker(*key)
+        return self._protected_check(path)
 
     def cleanup_empty_folders(self):
         """Walk scanned directories bottom-up and remove empty folders.
@@ -1458,6 +1996,9 @@ WScript.Sleep 2000
     def alert_user(self, title, msg):
         self.root.after(0, lambda: messagebox.showwarning(title, msg))
         self.root.after(0, lambda: self.btn_scan.config(state=tk.NORMAL))
+        self.root.after(0, lambda: self.btn_cancel_scan.config(state=tk.DISABLED))
+        self.root.after(0, self._take_progress)
+        self.root.after(0, self._set_progress, None, 0)
 
     # --- SCANNING ---
     def start_scan(self):
@@ -1472,46 +2013,115 @@ WScript.Sleep 2000
         self.clear_results()
 
         mode_name = "Smart" if self.scan_mode.get() == SCAN_SMART else "Full"
+        trust_size = self.trust_media_size.get()
+        if trust_size:
+            mode_name += " + size-only media"
         log.info(f"Scan started — mode: {mode_name}, target: {t}" + (f", master: {m}" if m else ""))
-        Comparator(m, t, self.scan_mode.get(), self.update_ui, self.scan_finished, self.alert_user).start()
+        self.comparator = Comparator(m, t, self.scan_mode.get(), self.update_ui, self.scan_finished, self.alert_user,
+                                     trust_media_size=trust_size)
+        self.comparator.start()
+        self.btn_cancel_scan.config(state=tk.NORMAL)
+
+    def cancel_scan(self):
+        """Ask the running scan to stop; it finishes early with no results."""
+        if self.comparator:
+            self.comparator.stop_event.set()
+        self.btn_cancel_scan.config(state=tk.DISABLED)
+        self.lbl_stat.config(text="Cancelling scan...")
 
     def update_ui(self, msg, pct):
-        self.root.after(0, lambda: [self.lbl_stat.config(text=msg), self.progress.configure(value=pct)])
+        self._progress_queue.put((msg, pct))
+
+    def _take_progress(self):
+        """Empty the progress queue, returning the newest (msg, pct) or None."""
+        latest = None
+        try:
+            while True:
+                latest = self._progress_queue.get_nowait()
+        except queue.Empty:
+            pass
+        return latest
+
+    def _drain_progress(self):
+        latest = self._take_progress()
+        if latest:
+            self._set_progress(*latest)
+        self.root.after(100, self._drain_progress)
+
+    def _set_progress(self, msg, pct):
+        """msg=None keeps the current status text. pct=None switches the bar to
+        indeterminate mode for phases where the total isn't known yet."""
+        if msg is not None:
+            self.lbl_stat.config(text=msg)
+        if pct is None:
+            if str(self.progress['mode']) != 'indeterminate':
+                self.progress.configure(mode='indeterminate', value=0)
+                self.progress.start(15)
+            return
+        if str(self.progress['mode']) == 'indeterminate':
+            self.progress.stop()
+            self.progress.configure(mode='determinate')
+        self.progress.configure(value=pct)
 
     def scan_finished(self, master_idx, target_idx):
+        # A cancelled scan's indices are incomplete (or unverified); keep nothing
+        if self.comparator and self.comparator.stop_event.is_set():
+            master_idx, target_idx = {}, {}
         self.last_master_idx = master_idx
         self.last_target_idx = target_idx
-        self.root.after(0, self.calculate_and_populate)
+        self.root.after(0, self._show_scan_results)
+
+    def _show_scan_results(self):
+        # Drop progress still queued from the scan so it can't overwrite the results status
+        self._take_progress()
+        self.btn_cancel_scan.config(state=tk.DISABLED)
+        if self.comparator and self.comparator.stop_event.is_set():
+            log.info("Scan cancelled")
+            self.lbl_stat.config(text="Scan cancelled.")
+            self._set_progress(None, 0)
+            self.btn_scan.config(state=tk.NORMAL)
+            return
+        self.calculate_and_populate()
 
     # --- LOGIC & CACHE ---
-    def calculate_and_populate(self):
-        """Runs the comparison logic on the currently stored indices."""
+    def calculate_and_populate(self, gone=None):
+        """Runs the comparison logic on the currently stored indices.
+        gone: paths just trashed; their rows are removed in place instead of
+        rebuilding every tab."""
         self.lbl_stat.config(text="Processing Results...")
 
-        cross_dupes = []
-        internal_dupes = []
+        target_idx = self.last_target_idx
+        compare = self.mode.get() == 1
+        master_idx = self.last_master_idx if compare else {}
+
+        # One C-level set intersection instead of a membership test + lookup per ident
+        common = target_idx.keys() & master_idx.keys()
+        cross_dupes = [{'master_file': master_idx[ident][0][0], 'target_files': target_idx[ident]}
+                       for ident in common]
+        internal_dupes = [entries for ident, entries in target_idx.items()
+                          if len(entries) > 1 and ident not in common]
+        # In compare mode, content with no match in master is unique to target
         only_in_target = []
-
-        for ident, t_entries in self.last_target_idx.items():
-            if self.mode.get() == 1 and self.last_master_idx and ident in self.last_master_idx:
-                cross_dupes.append({
-                    'master_file': self.last_master_idx[ident][0][0],
-                    'target_files': t_entries
-                })
-            else:
-                if len(t_entries) > 1:
-                    internal_dupes.append(t_entries)
-                # In compare mode, content with no match in master is unique to target
-                if self.mode.get() == 1:
-                    only_in_target.extend(t_entries)
+        if compare:
+            only_in_target = list(itertools.chain.from_iterable(
+                target_idx[ident] for ident in target_idx.keys() - common))
 
         self.cross_dupes = cross_dupes
         self.internal_dupes = internal_dupes
         self.only_in_target = only_in_target
-
-        self.populate_trees()
+        self.size_only_paths = {path for idx in (target_idx, master_idx)
+                                for ident, entries in idx.items() if ident[0] == 'sizeonly'
+                                for path, _ in entries}
+
+        if gone is None:
+            # Lets _forget_paths find the groups of trashed files without walking every index entry
+            self._path_idents = [(idx, {path: ident for ident, entries in idx.items() for path, _ in entries})
+                                 for idx in (self.last_target_idx, self.last_master_idx)]
+            self.populate_trees()
+        else:
+            self._prune_trees(gone)
         self.btn_scan.config(state=tk.NORMAL)
-        self.progress['value'] = 100
+        self._set_progress(None, 100)
 
         # Calculate totals
         total_waste = 0
@@ -1531,72 +2141,208 @@ WScript.Sleep 2000
         log.info(f"Scan complete — {len(internal_dupes)} internal groups, {len(cross_dupes)} cross matches, "
                  f"{len(only_in_target)} unique to target ({format_size(only_size)}), {format_size(total_waste)} recoverable")
 
+    @contextlib.contextmanager
+    def _bulk_insert(self, *trees):
+        """Unmap the given trees while rows are inserted, so Tk lays them out once
+        at the end instead of after every insert. Re-packs each tree in its old slot."""
+        saved = []
+        for tree in trees:
+            slaves = tree.master.pack_slaves()
+            i = slaves.index(tree)
+            next_sibling = slaves[i + 1] if i + 1 < len(slaves) else None
+            saved.append((tree, tree.pack_info(), next_sibling))
+            tree.pack_forget()
+        try:
+            yield
+        finally:
+            for tree, info, next_sibling in saved:
+                if next_sibling is not None:
+                    info['before'] = next_sibling
+                tree.pack(**info)
+
+    @staticmethod
+    def _display_name(path):
+        """(file name, parent folder name) for a tree row."""
+        # Scanned paths are normalized, so plain str.rpartition splits them
+        # correctly and skips os.path's per-call normalization work
+        folder, _, name = path.rpartition(os.sep)
+        return name, folder.rpartition(os.sep)[2]
+
     def populate_trees(self):
         self.clear_trees()
         pending = []  # (tree, item_id, path) — resolutions filled in by background thread
 
-        if self.mode.get() == 1:
-            for d in self.cross_dupes:
-                for path, size in d['target_files']:
-                    self.tree_cross.insert("", "end", values=(
-                        os.path.basename(path),
-                        format_size(size),
-                        os.path.basename(os.path.dirname(path)),
-                        "Safe to Delete",
-                        path
-                    ))
-
-        for group in self.internal_dupes:
-            group_size = format_size(group[0][1])
-            grp_id = self.tree_internal.insert("", "end", values=(
-                f"[GROUP] {len(group)} copies",
-                group_size,
-                "",
-                "",
-                ""
-            ), open=True)
-
-            # Sort: best path first (score-based)
-            scored = sorted(group, key=lambda e: self._path_score(e[0]))
-            for i, (path, size) in enumerate(scored):
-                is_protected = self.is_protected(path)
-                if is_protected:
-                    tag = "protected"
-                    prefix = "PROTECTED  "
-                elif i == 0:
-                    tag = "keeper"
-                    prefix = "KEEP  "
+        with self._bulk_insert(self.tree_cross, self.tree_internal, self.tree_only):
+            if self.mode.get() == 1:
+                rows = []
+                display_name = self._display_name
+                size_only = self.size_only_paths
+                for d in self.cross_dupes:
+                    for path, size in d['target_files']:
+                        name, folder_name = display_name(path)
+                        status = "Same size only" if path in size_only else "Safe to Delete"
+                        rows.append((name, format_size(size), folder_name, status, path))
+                # File rows use their path as iid: Tk skips generating one, and a
+                # row can be found again by path. Group headers get "g<n>".
+                insert = self.tree_cross.insert
+                for values in rows:
+                    insert("", "end", iid=values[-1], values=values)
+
+            # Big result sets: insert only the group rows and fill in each group's
+            # files when it is first opened, so populating stays fast
+            lazy = len(self.internal_dupes) > self.LAZY_GROUP_THRESHOLD
+            self._lazy_groups = {}  # group iid -> files, until the group is first opened
+            for n, group in enumerate(self.internal_dupes):
+                group_size = format_size(group[0][1])
+                size_only = group[0][0] in self.size_only_paths
+                grp_id = self.tree_internal.insert("", "end", iid=f"g{n}", values=(
+                    self._group_label(len(group), size_only),
+                    group_size,
+                    "",
+                    "",
+                    ""
+                ), open=not lazy, tags=("sizeonly",) if size_only else ())
+                if lazy:
+                    self.tree_internal.insert(grp_id, "end", iid=f"{grp_id}:stub", values=("Loading...", "", "", "", ""))
+                    self._lazy_groups[grp_id] = group
                 else:
-                    tag = "dupe"
-                    prefix = ""
-                # Use cached resolution if available, else "" (filled in by background thread)
-                res = _RESOLUTION_CACHE.get(path, "")
-                item_id = self.tree_internal.insert(grp_id, "end", values=(
-                    prefix + os.path.basename(path),
-                    format_size(size),
-                    res,
-                    os.path.basename(os.path.dirname(path)),
-                    path
-                ), tags=(tag,))
-                if not res:
-                    pending.append((self.tree_internal, item_id, path))
+                    pending.extend(self._insert_group_children(grp_id, group))
+
+            pending.extend(self.populate_only_tree())
 
         # Color the keeper vs dupes vs protected
         self.tree_internal.tag_configure("protected", foreground="#d32f2f", font=("Arial", 9, "bold"))
         self.tree_internal.tag_configure("keeper", foreground="#2e7d32")
         self.tree_internal.tag_configure("dupe", foreground="#666666")
-
-        pending.extend(self.populate_only_tree())
+        self.tree_internal.tag_configure("sizeonly", foreground="#e65100")
 
         if pending:
             self._start_resolution_lookup(pending)
 
-    def _start_resolution_lookup(self, items):
+    # Above this many duplicate groups, group rows are filled in on first open
+    LAZY_GROUP_THRESHOLD = 2000
+
+    @staticmethod
+    def _group_label(count, size_only):
+        label = f"[GROUP] {count} copies"
+        return label + " (same size only)" if size_only else label
+
+    def _insert_group_children(self, grp_id, group):
+        """Insert one row per file of an internal-duplicate group, best path first.
+        Returns (tree, item_id, path) entries whose resolution still needs looking up."""
+        pending = []
+        # Sort: best path first (score-based)
+        scored = sorted(group, key=lambda e: self._path_score(e[0]))
+        for i, (path, size) in enumerate(scored):
+            is_protected = self.is_protected(path)
+            if is_protected:
+                tag = "protected"
+                prefix = "PROTECTED  "
+            elif i == 0:
+                tag = "keeper"
+                prefix = "KEEP  "
+            else:
+                tag = "dupe"
+                prefix = ""
+            # Use cached resolution if available, else "" (filled in by background thread)
+            res = _RESOLUTION_CACHE.get(path, "")
+            name, folder_name = self._display_name(path)
+            item_id = self.tree_internal.insert(grp_id, "end", iid=path, values=(
+                prefix + name,
+                format_size(size),
+                res,
+                folder_name,
+                path
+            ), tags=(tag,))
+            if not res:
+                pending.append((self.tree_internal, item_id, path))
+        return pending
+
+    def _fill_group(self, grp_id):
+        """Replace a lazily inserted group's placeholder with its file rows.
+        Returns the rows still needing a resolution lookup ([] if already filled)."""
+        group = self._lazy_groups.pop(grp_id, None)
+        if group is None:
+            return []
+        self.tree_internal.delete(f"{grp_id}:stub")
+        return self._insert_group_children(grp_id, group)
+
+    def _prune_trees(self, gone):
+        """Delete the rows of trashed files from every tab, dropping group and folder
+        headers that no longer hold anything and updating the counts of the rest."""
+        groups = set()
+        folders = set()
+        for path in gone:
+            if self.tree_cross.exists(path):
+                self.tree_cross.delete(path)
+            if self.tree_internal.exists(path):
+                groups.add(self.tree_internal.parent(path))
+                self.tree_internal.delete(path)
+            if self.tree_only.exists(path):
+                folders.add(self.tree_only.parent(path))
+                self.tree_only.delete(path)
+        # Groups not opened yet have no rows; trim their pending file lists instead
+        for grp_id, group in self._lazy_groups.items():
+            remaining = [e for e in group if e[0] not in gone]
+            if len(remaining) != len(group):
+                self._lazy_groups[grp_id] = remaining
+                groups.add(grp_id)
+
+        for grp_id in groups:
+            if grp_id in self._lazy_groups:
+                count = len(self._lazy_groups[grp_id])
+            else:
+                count = len(self.tree_internal.get_children(grp_id))
+            if count < 2:
+                # A lone file is no longer a duplicate
+                self.tree_internal.delete(grp_id)
+                self._lazy_groups.pop(grp_id, None)
+            else:
+                vals = list(self.tree_internal.item(grp_id, "values"))
+                vals[0] = self._group_label(count, "sizeonly" in self.tree_internal.item(grp_id, "tags"))
+                self.tree_internal.item(grp_id, values=vals)
+                if grp_id not in self._lazy_groups:
+                    # The keeper may have been trashed by hand: the best remaining row
+                    # (rows stay in score order) takes over
+                    first = self.tree_internal.get_children(grp_id)[0]
+                    if "dupe" in self.tree_internal.item(first, "tags"):
+                        vals = list(self.tree_internal.item(first, "values"))
+                        vals[0] = "KEEP  " + vals[0]
+                        self.tree_internal.item(first, values=vals, tags=("keeper",))
+
+        if folders:
+            folder_totals = defaultdict(int)
+            for path, size in self.only_in_target:
+                folder_totals[os.path.dirname(path)] += size
+        for grp_id in folders:
+            files = self.tree_only.get_children(grp_id)
+            if not files:
+                self.tree_only.delete(grp_id)
+                continue
+            folder = os.path.dirname(files[0])
+            folder_total = folder_totals[folder]
+            vals = list(self.tree_only.item(grp_id, "values"))
+            vals[0] = f"[FOLDER] {folder}  ({len(files)} files)"
+            vals[1] = format_size(folder_total)
+            self.tree_only.item(grp_id, values=vals)
+
+    def _expand_group(self, event=None):
+        """<<TreeviewOpen>> handler for lazily filled groups."""
+        grp_id = self.tree_internal.focus()
+        if grp_id:
+            pending = self._fill_group(grp_id)
+            if pending:
+                self._start_resolution_lookup(pending, new_scan=False)
+
+    def _start_resolution_lookup(self, items, new_scan=True):
         """Compute resolutions in a background thread and patch them into the
-        relevant tree rows. Keeps the GUI responsive when many videos are listed."""
+        relevant tree rows. Keeps the GUI responsive when many videos are listed.
+        new_scan=False adds rows to the current results without cancelling
+        lookups already running for them."""
         # Snapshot a token so stale background updates from a previous scan get ignored
-        self._resolution_token = getattr(self, "_resolution_token", 0) + 1
-        my_token = self._resolution_token
+        if new_scan:
+            self._resolution_token = getattr(self, "_resolution_token", 0) + 1
+        my_token = getattr(self, "_resolution_token", 0)
 
         def _worker():
             try:
@@ -1638,26 +2384,27 @@ WScript.Sleep 2000
         # Group by parent folder
         by_folder = {}
         for path, size in self.only_in_target:
-            folder = os.path.dirname(path)
-            by_folder.setdefault(folder, []).append((path, size))
+            folder, name = os.path.split(path)
+            by_folder.setdefault(folder, []).append((path, size, name))
 
-        for folder in sorted(by_folder.keys()):
-            files = sorted(by_folder[folder], key=lambda e: os.path.basename(e[0]).lower())
-            folder_total = sum(s for _, s in files)
-            grp_id = self.tree_only.insert("", "end", values=(
+        for n, folder in enumerate(sorted(by_folder.keys())):
+            files = sorted(by_folder[folder], key=lambda e: e[2].lower())
+            folder_total = sum(e[1] for e in files)
+            grp_id = self.tree_only.insert("", "end", iid=f"g{n}", values=(
                 f"[FOLDER] {folder}  ({len(files)} files)",
                 format_size(folder_total),
                 "",
                 "",
                 ""
             ), open=True, tags=("folderhdr",))
-            for path, size in files:
+            folder_name = os.path.basename(folder)
+            for path, size, name in files:
                 res = _RESOLUTION_CACHE.get(path, "")
-                item_id = self.tree_only.insert(grp_id, "end", values=(
-                    os.path.basename(path),
+                item_id = self.tree_only.insert(grp_id, "end", iid=path, values=(
+                    name,
                     format_size(size),
                     res,
-                    os.path.basename(os.path.dirname(path)),
+                    folder_name,
                     path
                 ))
                 if not res:
@@ -1715,63 +2462,124 @@ WScript.Sleep 2000
                 f"structure is recreated under master."):
             return
 
-        def _strip_lp(p):
-            r"""Strip Windows long-path prefix so paths from prepare_path()
-            (which may add \\?\) can be compared with the user-typed root."""
-            p = str(p)
-            if p.startswith('\\\\?\\'):
-                p = p[4:]
-            return p
-
-        target_root = os.path.abspath(_strip_lp(self.target_path))
-        master_root = os.path.abspath(_strip_lp(self.master_path))
+        # Strip the long-path prefix so paths from prepare_path() can be
+        # compared with the user-typed roots
+        target_root = os.path.abspath(strip_long_path_prefix(self.target_path))
+        master_root = os.path.abspath(strip_long_path_prefix(self.master_path))
         files = list(self.only_in_target)
 
         self.btn_scan.config(state=tk.DISABLED)
         self.btn_sync_master.config(state=tk.DISABLED)
         self.lbl_stat.config(text="Copying to master...")
 
+        listings = {}
+
+        def _claim(dst):
+            """Reserve a free destination name with an O_EXCL create. Each master
+            folder is listed once, so taken names are skipped without a stat each."""
+            folder, name = os.path.split(dst)
+            taken = listings.get(folder)
+            if taken is None:
+                try:
+                    taken = set(os.listdir(prepare_path(folder)))
+                except FileNotFoundError:
+                    os.makedirs(prepare_path(folder), exist_ok=True)
+                    taken = set()
+                listings[folder] = taken
+            base, ext = os.path.splitext(name)
+            n = 0
+            candidate = name
+            while True:
+                if candidate not in taken:
+                    taken.add(candidate)
+                    full = prepare_path(os.path.join(folder, candidate))
+                    try:
+                        os.close(os.open(full, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+                        return full
+                    except FileExistsError:
+                        # e.g. a case-only difference on Windows/macOS
+                        pass
+                n += 1
+                candidate = f"{base} (from target {n}){ext}"
+
+        def _copy(job):
+            src, dst_full = job
+            try:
+                # copy2 writes over the empty placeholder claimed by _claim()
+                shutil.copy2(src, dst_full)
+                return True
+            except Exception as e:
+                log.warning(f"Could not copy {src} to master: {e}")
+                try:
+                    os.remove(dst_full)
+                except OSError:
+                    pass
+                return False
+
+        def _destination(path):
+            # Strip long-path prefix from both src and root before relpath,
+            # otherwise relpath raises ValueError ("paths on different mounts")
+            src_norm = os.path.abspath(strip_long_path_prefix(path))
+            try:
+                rel = os.path.relpath(src_norm, target_root)
+                if rel.startswith("..") or os.path.isabs(rel):
+                    rel = os.path.basename(src_norm)
+            except ValueError:
+                rel = os.path.basename(src_norm)
+            return os.path.join(master_root, rel)
+
         def _worker():
             copied = 0
             failed = 0
-            try:
-                for i, (path, size) in enumerate(files):
-                    try:
-                        # Strip long-path prefix from both src and root before relpath,
-                        # otherwise relpath raises ValueError ("paths on different mounts")
-                        src_norm = os.path.abspath(_strip_lp(path))
-                        try:
-                            rel = os.path.relpath(src_norm, target_root)
-                            if rel.startswith("..") or os.path.isabs(rel):
-                                rel = os.path.basename(src_norm)
-                        except ValueError:
-                            rel = os.path.basename(src_norm)
-                        dst = os.path.join(master_root, rel)
-                        # Use the original (possibly prefixed) path for the actual copy
-                        # so very deep paths still work on Windows
-                        src = path
-
-                        # Avoid clobbering a different file already at that path
-                        if os.path.exists(dst):
-                            base, ext = os.path.splitext(dst)
-                            n = 1
-                            while os.path.exists(f"{base} (from target {n}){ext}"):
-                                n += 1
-                            dst = f"{base} (from target {n}){ext}"
-
-                        # Re-add long-path prefix on Windows if the final path exceeds 259 chars
-                        dst_full = prepare_path(dst)
-                        os.makedirs(os.path.dirname(dst_full), exist_ok=True)
-                        shutil.copy2(src, dst_full)
+            last_ui = 0.0
+            in_flight = {}  # future -> claimed destination
+
+            def _collect(finished):
+                nonlocal copied, failed, last_ui
+                for fut in finished:
+                    del in_flight[fut]
+                    if fut.result():
                         copied += 1
-                    except Exception as e:
-                        log.warning(f"Could not copy {path} to master: {e}")
+                    else:
                         failed += 1
+                done = copied + failed
+                now = time.monotonic()
+                if now - last_ui >= UI_INTERVAL or done == total:
+                    last_ui = now
+                    self.root.after(0, lambda d=done: self.lbl_stat.config(
+                        text=f"Copying to master... {d}/{total}"))
 
-                    if (i + 1) % 25 == 0 or (i + 1) == total:
-                        done = i + 1
-                        self.root.after(0, lambda d=done: self.lbl_stat.config(
-                            text=f"Copying to master... {d}/{total}"))
+            try:
+                # Several copies in flight hide per-file latency on network/cloud drives.
+                # Destinations are claimed on this one thread, so parallel copies can never
+                # race for the same "(from target N)" name, and only just before their copy
+                # is queued, so at most a couple of batches of empty placeholders exist at once
+                with concurrent.futures.ThreadPoolExecutor(max_workers=self.SYNC_WORKERS) as executor:
+                    try:
+                        for path, size in files:
+                            if len(in_flight) >= self.SYNC_WORKERS * 2:
+                                _collect(concurrent.futures.wait(
+                                    in_flight, return_when=concurrent.futures.FIRST_COMPLETED)[0])
+                            try:
+                                # Avoid clobbering a different file already at that path.
+                                # Use the original (possibly prefixed) path for the actual copy
+                                # so very deep paths still work on Windows
+                                dst_full = _claim(_destination(path))
+                            except Exception as e:
+                                log.warning(f"Could not copy {path} to master: {e}")
+                                failed += 1
+                                continue
+                            in_flight[executor.submit(_copy, (path, dst_full))] = dst_full
+                        for fut in concurrent.futures.as_completed(list(in_flight)):
+                            _collect((fut,))
+                    finally:
+                        # After a crash, release the names whose copy never started
+                        for fut, dst_full in list(in_flight.items()):
+                            if fut.cancel():
+                                try:
+                                    os.remove(dst_full)
+                                except OSError:
+                                    pass
             except Exception as e:
                 log.error(f"Sync to master crashed: {e}", exc_info=True)
             finally:
@@ -1790,6 +2598,9 @@ WScript.Sleep 2000
 
         threading.Thread(target=_worker, daemon=True).start()
 
+    # "name (2).ext" style download duplicates
+    _NUMBERED_COPY_RE = re.compile(r'\(\d+\)\.[a-z]+$')
+
     def _path_score(self, path):
         """Lower score = better path to keep.
         Protected folder files always win. Then prefers organized names, no (1)(2) suffixes."""
@@ -1801,12 +2612,12 @@ WScript.Sleep 2000
             return -100000
 
         # Penalize (1)(2)(3) download duplicates heavily
-        if re.search(r'\(\d+\)\.[a-z]+$', rel):
+        if self._NUMBERED_COPY_RE.search(rel):
             score += 1000
 
         # Penalize "download " prefix
-        basename = os.path.basename(rel)
-        if basename.startswith('download '):
+        name = path.rpartition(os.sep)[2]
+        if name.lower().startswith('download '):
             score += 500
 
         # Penalize "copy of" or "- copy"
@@ -1814,7 +2625,7 @@ WScript.Sleep 2000
             score += 500
 
         # Prefer files with "CF " prefix (organized/renamed)
-        if os.path.basename(path).startswith('CF '):
+        if name.startswith('CF '):
             score -= 200
 
         # Prefer files in named/organized folders
@@ -1850,6 +2661,8 @@ WScript.Sleep 2000
         self.cross_dupes = []
         self.internal_dupes = []
         self.only_in_target = []
+        self.size_only_paths = set()
+        self._path_idents = []
         self.lbl_summary.config(text="")
 
     # --- SAVE / LOAD ---
@@ -1860,27 +2673,33 @@ WScript.Sleep 2000
         f = filedialog.asksaveasfilename(defaultextension=".cache", filetypes=[("Scan Cache", "*.cache")])
         if f:
             try:
-                data = {
-                    'master': self.last_master_idx,
-                    'target': self.last_target_idx,
-                    'mode': self.mode.get()
-                }
-                with open(f, 'wb') as outfile:
-                    pickle.dump(data, outfile)
+                save_scan_results(f, self.last_master_idx, self.last_target_idx, self.mode.get())
                 messagebox.showinfo("Saved", "Scan results saved successfully.")
             except Exception as e:
                 messagebox.showerror("Error", f"Could not save: {e}")
 
+    def clear_hash_cache(self):
+        """Delete the on-disk hash database so the next scan re-reads every file."""
+        if not messagebox.askyesno("Forget Hashes", "Delete stored file hashes? The next scan will re-hash every file."):
+            return
+        removed = False
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(HASH_CACHE_PATH + suffix)
+                removed = True
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                return messagebox.showerror("Error", f"Could not delete hash database: {e}")
+        if removed:
+            log.info(f"Deleted hash database {HASH_CACHE_PATH}")
+
     def load_cache(self):
         f = filedialog.askopenfilename(filetypes=[("Scan Cache", "*.cache")])
         if f:
             try:
-                with open(f, 'rb') as infile:
-                    data = pickle.load(infile)
-
-                self.last_master_idx = data.get('master', {})
-                self.last_target_idx = data.get('target', {})
-                self.mode.set(data.get('mode', 2))
+                self.last_master_idx, self.last_target_idx, mode = load_scan_results(f)
+                self.mode.set(mode)
                 self.toggle_mode()
 
                 self.calculate_and_populate()
@@ -1898,41 +2717,67 @@ WScript.Sleep 2000
         if vals and vals[-1]:
             reveal_in_explorer(vals[-1])
 
+    def _require_send2trash(self):
+        """True if send2trash is importable. Otherwise offer to install it in the
+        background (pip can take a while) and return False."""
+        if send2trash is not None:
+            return True
+        if not messagebox.askyesno("send2trash missing",
+                "Moving files to the Recycle Bin needs the 'send2trash' package.\n\nInstall it now?"):
+            return False
+        self.lbl_stat.config(text="Installing send2trash...")
+
+        def _worker():
+            mod = install_and_import('send2trash', min_version=SEND2TRASH_MIN_VERSION)
+            self.root.after(0, _done, mod)
+
+        def _done(mod):
+            global send2trash
+            send2trash = mod
+            if mod is None:
+                self.lbl_stat.config(text="send2trash install failed (see Log).")
+                messagebox.showerror("Error", "Could not install send2trash. Try: pip install send2trash")
+            else:
+                self.lbl_stat.config(text="send2trash installed. Run the action again.")
+
+        threading.Thread(target=_worker, daemon=True).start()
+        return False
+
+    # Files per send2trash call
+    TRASH_BATCH = 50
+    # Parallel copies for "Copy These to Master"
+    SYNC_WORKERS = 16
+
     def _trash_batch(self, paths, on_done):
-        """Trash a list of paths in a background thread using batched send2trash."""
+        """Trash a list of paths in a background thread using batched send2trash.
+        Batches run one after another: send2trash picks a free name in the trash and
+        then renames onto it, so concurrent calls can overwrite each other's files.
+        Calls on_done(trashed_paths, failed_count) on the Tk thread."""
+        def _trash_one_batch(batch):
+            try:
+                send2trash.send2trash(batch)
+                return batch, 0
+            except Exception:
+                trashed = []
+                failed = 0
+                for p in batch:
+                    try:
+                        send2trash.send2trash(p)
+                        trashed.append(p)
+                    except Exception as e:
+                        log.warning(f"Could not trash {p}: {e}")
+                        failed += 1
+                return trashed, failed
+
         def _worker():
-            trashed = 0
+            trashed = []
             failed = 0
             try:
-                batch = []
-                for path in paths:
-                    batch.append(path)
-                    if len(batch) >= 50:
-                        try:
-                            send2trash.send2trash(batch)
-                            trashed += len(batch)
-                        except Exception:
-                            for p in batch:
-                                try:
-                                    send2trash.send2trash(p)
-                                    trashed += 1
-                                except Exception as e:
-                                    log.warning(f"Could not trash {p}: {e}")
-                                    failed += 1
-                        batch = []
-                        self.root.after(0, lambda t=trashed: self.lbl_stat.config(text=f"Trashing... {t}/{len(paths)}"))
-                if batch:
-                    try:
-                        send2trash.send2trash(batch)
-                        trashed += len(batch)
-                    except Exception:
-                        for p in batch:
-                            try:
-                                send2trash.send2trash(p)
-                                trashed += 1
-                            except Exception as e:
-                                log.warning(f"Could not trash {p}: {e}")
-                                failed += 1
+                for i in range(0, len(paths), self.TRASH_BATCH):
+                    t, f = _trash_one_batch(paths[i:i + self.TRASH_BATCH])
+                    trashed.extend(t)
+                    failed += f
+                    self.root.after(0, lambda t=len(trashed): self.lbl_stat.config(text=f"Trashing... {t}/{len(paths)}"))
             except Exception as e:
                 log.error(f"Trash worker crashed: {e}", exc_info=True)
             finally:
@@ -1940,15 +2785,39 @@ WScript.Sleep 2000
                 self.root.after(0, on_done, trashed, failed)
         threading.Thread(target=_worker, daemon=True).start()
 
+    def _forget_paths(self, gone):
+        """Drop trashed paths from the stored scan indices and recompute the tabs
+        from memory, instead of clearing the results or re-scanning."""
+        gone = set(gone)
+        if not gone:
+            return
+        for idx, path_idents in self._path_idents:
+            for ident in {path_idents.pop(p) for p in gone if p in path_idents}:
+                remaining = [e for e in idx[ident] if e[0] not in gone]
+                if remaining:
+                    idx[ident] = remaining
+                else:
+                    del idx[ident]
+        self.calculate_and_populate(gone)
+
     def trash_cross(self):
-        if not self.cross_dupes:
+        if not self.cross_dupes or not self._require_send2trash():
             return
         paths = []
+        # Master is fixed for the whole action, so normalize it once
+        in_master = make_subpath_checker(self.master_path)
+        skipped = 0
         for d in self.cross_dupes:
             for path, size in d['target_files']:
-                if self.master_path and is_subpath(path, self.master_path):
+                if in_master(path):
+                    continue
+                # Size-only matches aren't byte-verified; they have to be trashed by hand
+                if path in self.size_only_paths:
+                    skipped += 1
                     continue
                 paths.append(path)
+        if skipped:
+            messagebox.showinfo("Size match only", f"Skipped {skipped} file(s) matched by size only.")
         if not paths:
             return
         if not messagebox.askyesno("Confirm", f"Trash {len(paths)} files from Tab 1?"):
@@ -1956,15 +2825,15 @@ WScript.Sleep 2000
         self.btn_scan.config(state=tk.DISABLED)
         self.lbl_stat.config(text="Trashing...")
 
-        def _done(trashed, failed):
+        def _done(trashed_paths, failed):
+            trashed = len(trashed_paths)
             msg = f"Trashed {trashed} files."
             if failed:
                 msg += f"\n{failed} files could not be trashed."
             messagebox.showinfo("Done", msg)
             log.info(f"Cross-folder trash: {trashed} trashed, {failed} failed")
-            self.cross_dupes = []
-            self.clear_trees()
-            self.lbl_summary.config(text=f"Trashed {trashed} files.")
+            self._forget_paths(trashed_paths)
+            self.lbl_stat.config(text=f"Trashed {trashed} files.")
             self.btn_scan.config(state=tk.NORMAL)
             self.cleanup_empty_folders()
 
@@ -1973,11 +2842,10 @@ WScript.Sleep 2000
     def delete_selected_internal(self):
         """Trash all selected items (supports multi-select)."""
         sel = self.tree_internal.selection()
-        if not sel:
+        if not sel or not self._require_send2trash():
             return
 
         paths_to_trash = []
-        item_ids = []
         skipped_protected = 0
         for item_id in sel:
             vals = self.tree_internal.item(item_id, "values")
@@ -1987,7 +2855,6 @@ WScript.Sleep 2000
                     skipped_protected += 1
                     continue
                 paths_to_trash.append(path)
-                item_ids.append(item_id)
 
         if skipped_protected:
             messagebox.showinfo("Protected", f"Skipped {skipped_protected} file(s) in protected folders.")
@@ -2001,14 +2868,11 @@ WScript.Sleep 2000
         self.btn_scan.config(state=tk.DISABLED)
         self.lbl_stat.config(text="Trashing...")
 
-        def _done(trashed, failed):
-            for iid in item_ids:
-                try:
-                    self.tree_internal.delete(iid)
-                except Exception:
-                    pass
+        def _done(trashed_paths, failed):
+            trashed = len(trashed_paths)
             if trashed:
                 log.info(f"Internal trash: {trashed} files deleted")
+                self._forget_paths(trashed_paths)
                 self.lbl_stat.config(text=f"Trashed {trashed} files.")
                 self.cleanup_empty_folders()
             self.btn_scan.config(state=tk.NORMAL)
@@ -2017,12 +2881,21 @@ WScript.Sleep 2000
 
     def select_all_except_best(self):
         """Select all non-KEEP items in every group for easy bulk delete.
-        Never selects files inside the protected folder."""
+        Never selects files inside the protected folder, or groups matched by size only."""
         self.tree_internal.selection_remove(*self.tree_internal.selection())
+        # Lazily filled groups need their file rows before they can be selected
+        pending = []
+        with self._bulk_insert(self.tree_internal):
+            for group_id in self.tree_internal.get_children():
+                pending.extend(self._fill_group(group_id))
+        if pending:
+            self._start_resolution_lookup(pending, new_scan=False)
         to_select = []
         for group_id in self.tree_internal.get_children():
             children = self.tree_internal.get_children(group_id)
             # Skip the first child (best/keeper), select the rest
+            if "sizeonly" in self.tree_internal.item(group_id, "tags"):
+                continue
             for child_id in children[1:]:
                 vals = self.tree_internal.item(child_id, "values")
                 path = vals[-1] if vals else ""
@@ -2035,16 +2908,18 @@ WScript.Sleep 2000
 
     def auto_cull_internal(self):
         """Keep the best-scored path in each group and trash the rest."""
-        if not self.internal_dupes:
+        if not self.internal_dupes or not self._require_send2trash():
             return
 
-        total_dupes = sum(len(g) - 1 for g in self.internal_dupes)
-        if not messagebox.askyesno("Auto-Clean",
+        # Groups matched by size only aren't byte-verified, so they are never auto-cleaned
+        groups = [g for g in self.internal_dupes if g[0][0] not in self.size_only_paths]
+        total_dupes = sum(len(g) - 1 for g in groups)
+        if not groups or not messagebox.askyesno("Auto-Clean",
                 f"Keep the best path in each group and trash {total_dupes} duplicates?"):
             return
 
         paths = []
-        for group in self.internal_dupes:
+        for group in groups:
             scored = sorted(group, key=lambda e: self._path_score(e[0]))
             for path, size in scored[1:]:
                 if not self.is_protected(path):
@@ -2056,15 +2931,15 @@ WScript.Sleep 2000
         self.btn_scan.config(state=tk.DISABLED)
         self.lbl_stat.config(text="Trashing...")
 
-        def _done(trashed, failed):
+        def _done(trashed_paths, failed):
+            trashed = len(trashed_paths)
             msg = f"Trashed {trashed} duplicate files."
             if failed:
                 msg += f"\n{failed} files could not be trashed."
             messagebox.showinfo("Done", msg)
             log.info(f"Auto-cull: {trashed} trashed, {failed} failed")
-            self.internal_dupes = []
-            self.clear_trees()
-            self.lbl_summary.config(text=f"Trashed {trashed} files. Run a new scan to verify.")
+            self._forget_paths(trashed_paths)
+            self.lbl_stat.config(text=f"Trashed {trashed} files.")
             self.btn_scan.config(state=tk.NORMAL)
             self.cleanup_empty_folders()
 
@@ -2072,6 +2947,7 @@ WScript.Sleep 2000
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     root = tk.Tk()
     App(root)
     root.mainloop()